@@ -20,7 +20,8 @@ import copy as _copymod
 import codecs
 import struct as _struct
 import logging
-from typing import Dict, List, Optional
+import functools as _functools
+from typing import Dict, List, Tuple, Optional
 
 from pefile import PE as _PE
 from pefile import DIRECTORY_ENTRY, MAX_SYMBOL_EXPORT_COUNT, Dump, Structure, DataContainer, PEFormatError
@@ -235,6 +236,30 @@ class ClrMetaDataStruct(Structure):
     NumberOfStreams: int
 
 
+# the fixed-size prefix of the metadata header, up to and including VersionLength.
+_METADATA_HEADER_PREFIX = _struct.Struct("<IHHII")
+
+
+@_functools.lru_cache(maxsize=32)
+def _metadata_header_format(version_length: int) -> Tuple[_struct.Struct, Tuple[str, Tuple[str, ...]]]:
+    """
+    Given the VersionLength of a metadata header,
+    return a compiled reader for the whole header and the matching Structure format.
+
+    Few distinct version lengths are seen in practice, so these are cached.
+    """
+    fields = list(ClrMetaData._format[1])
+    fmt = "<IHHII"
+    # add variable-length version field
+    if version_length > 0:
+        fields.append("{0}s,Version".format(version_length))
+        fmt += "{0}s".format(version_length)
+    fields.append("H,Flags")
+    fields.append("H,NumberOfStreams")
+    fmt += "HH"
+    return _struct.Struct(fmt), (ClrMetaData._format[0], tuple(fields))
+
+
 class ClrMetaData(DataContainer):
     """Holds CLR (.NET) MetaData.
 
@@ -283,54 +308,49 @@ class ClrMetaData(DataContainer):
         # The metadata RVA, used for stream offsets
         self.rva = rva
 
-        # dynamically create metadata header structure
-        struct_format = _copymod.deepcopy(self.__class__._format)
         struct_data = pe.get_data(rva, size)
         if len(struct_data) < size:
             raise errors.dnFormatError(
                 "Invalid CLR MetaData Structure size. Can't read %d "
                 "bytes at RVA: 0x%x" % (size, rva)
             )
-        # check signature
-        sig = _struct.unpack_from("<I", struct_data)[0]
+        if len(struct_data) < _METADATA_HEADER_PREFIX.size:
+            raise errors.dnFormatError(
+                "unable to read CLR metadata structure, expected {} got {}".format(
+                    _METADATA_HEADER_PREFIX.size, len(struct_data)
+                )
+            )
+        # check signature and get the version length
+        sig, _, _, _, version_length = _METADATA_HEADER_PREFIX.unpack_from(struct_data)
         if sig != CLR_METADATA_SIGNATURE:
             raise errors.dnFormatError(
                 "Invalid CLR MetaData Signature at 0x%x. Expected 0x%x but "
                 "got 0x%x" % (rva, CLR_METADATA_SIGNATURE, sig)
             )
-        # parse struct so that we can get the version length
-        metadata_struct = ClrMetaDataStruct(
-            format=struct_format,
-            file_offset=pe.get_offset_from_rva(metadata_rva)
-        )
-        metadata_struct.__unpack__(struct_data)
-        # metadata_struct = pe.__unpack_data__(
-        #     struct_format, struct_data, pe.get_offset_from_rva(metadata_rva)
-        # )
-        # add variable-length version field
-        if metadata_struct.VersionLength > 0:
-            struct_format[1].append(
-                "{0}s,Version".format(metadata_struct.VersionLength)
-            )
-        # add Flags
-        struct_format[1].append("H,Flags")
-        # add NumberOfStreams
-        struct_format[1].append("H,NumberOfStreams")
 
-        # re-parse metadata header structure
-        metadata_struct = ClrMetaDataStruct(
-            format=struct_format,
-            file_offset=pe.get_offset_from_rva(metadata_rva)
-        )
-        struct_size = metadata_struct.sizeof()
-        struct_data = pe.get_data(metadata_rva, struct_size)
+        # the header is variable-length, so fetch the reader for this version length
+        header_reader, struct_format = _metadata_header_format(version_length)
+        struct_size = header_reader.size
+        if len(struct_data) < struct_size:
+            # the declared metadata size is smaller than the header, so read past it
+            struct_data = pe.get_data(metadata_rva, struct_size)
         if len(struct_data) < struct_size:
             raise errors.dnFormatError(
                 "unable to read full CLR metadata structure, expected {} got {}".format(
                     struct_size, len(struct_data)
                 )
             )
-        metadata_struct.__unpack__(struct_data)
+
+        # unpack the whole header in one call,
+        # and populate the Structure used for dumping and field offsets.
+        metadata_struct = ClrMetaDataStruct(
+            format=struct_format,
+            file_offset=pe.get_offset_from_rva(metadata_rva)
+        )
+        metadata_struct.__unpacked_data_elms__ = header_reader.unpack_from(struct_data)
+        for keys, value in zip(metadata_struct.__keys__, metadata_struct.__unpacked_data_elms__):
+            for key in keys:
+                setattr(metadata_struct, key, value)
 
         self.struct = metadata_struct
 
@@ -341,13 +361,20 @@ class ClrMetaData(DataContainer):
 
             # parse each stream
             for s in self.streams_list:
-                try:
-                    s.parse(self.streams_list, lazy_load=lazy_load)
-                except (errors.dnFormatError, PEFormatError) as e:
-                    # other streams may parse, so add to warnings and continue
-                    pe.add_warning("Unable to parse stream {!r}".format(s.struct.Name))
-                    pe.add_warning(str(e))
-                    logger.warning("unable to parse stream: %s: %s", s.struct.Name, e)
+                if lazy_load:
+                    # defer parsing until the stream's parsed data is first requested
+                    s.setup_lazy_load(_functools.partial(self._parse_stream, pe, s, lazy_load))
+                else:
+                    self._parse_stream(pe, s, lazy_load)
+
+    def _parse_stream(self, pe: dnPE, s: base.ClrStream, lazy_load: bool):
+        try:
+            s.parse(self.streams_list, lazy_load=lazy_load)
+        except (errors.dnFormatError, PEFormatError) as e:
+            # other streams may parse, so add to warnings and continue
+            pe.add_warning("Unable to parse stream {!r}".format(s.struct.Name))
+            pe.add_warning(str(e))
+            logger.warning("unable to parse stream: %s: %s", s.struct.Name, e)
 
     def parse_stream_table(self, pe: dnPE, streams_table_rva):
         streams_list = list()
@@ -355,7 +382,7 @@ class ClrMetaData(DataContainer):
         # pointer to current stream's table entry
         stream_entry_rva = streams_table_rva
         for i in range(self.struct.NumberOfStreams):
-            stream = ClrStreamFactory.createStream(pe, stream_entry_rva, self.rva)
+            stream, entry_size = ClrStreamFactory.createStream(pe, stream_entry_rva, self.rva)
             if not stream:
                 logger.warning("Invalid .NET stream: {}".format(i + 1))
                 pe.add_warning("Invalid .NET stream: {}".format(i + 1))
@@ -375,7 +402,7 @@ class ClrMetaData(DataContainer):
             # and test_invalid_streams.py::test_duplicate_stream
             streams_dict[name] = stream
             # move to next entry in streams table
-            stream_entry_rva += stream.stream_table_entry_size()
+            stream_entry_rva += entry_size
 
         self.streams = streams_dict
         self.streams_list = streams_list
@@ -601,14 +628,19 @@ class ClrStreamFactory(object):
     @classmethod
     def createStream(
         cls, pe: dnPE, stream_entry_rva: int, metadata_rva: int
-    ) -> Optional[base.ClrStream]:
+    ) -> Tuple[Optional[base.ClrStream], int]:
+        """
+        Parse the streams table entry at the given RVA and construct its stream.
+
+        Returns the stream, or None on error, and the size of the table entry, in bytes.
+        """
         # start with structure template
         struct_format = _copymod.deepcopy(cls._template_format)
         # read name
         name = pe.get_string_at_rva(stream_entry_rva + 8)
         if name is None:
             logger.warning("failed to read stream name")
-            return None
+            return None, 0
 
         # round field length up to next 4-byte boundary.  Remember the NULL byte at end.
         name_len = len(name) + (4 - (len(name) % 4))
@@ -637,6 +669,6 @@ class ClrStreamFactory(object):
             s.file_offset = pe.get_offset_from_rva(stream_rva)
         except errors.dnFormatError as e:
             logger.warning("failed to parse stream: %s", e)
-            return None
+            return None, struct_size
         else:
-            return s
+            return s, struct_size
@@ -8,9 +8,10 @@ import abc
 import enum
 import struct as _struct
 import logging
+import operator as _operator
 import functools as _functools
 import itertools as _itertools
-from typing import TYPE_CHECKING, Any, Dict, List, Type, Tuple, Union, Generic, TypeVar, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Dict, List, Type, Tuple, Union, Generic, TypeVar, Callable, Optional, Sequence
 
 from pefile import Structure
 
@@ -24,6 +25,12 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# metadata table name to table number, without going through the enum on every lookup.
+_TABLE_NUMBERS: Dict[str, int] = {name: t.value for name, t in enums.MetadataTables.__members__.items()}
+
+# little-endian DWORD, compiled once rather than looked up by format string on every read.
+_DWORD = _struct.Struct("<I")
+
 
 class CompressedInt(int):
     raw_size: int
@@ -64,8 +71,11 @@ class ClrStream(abc.ABC):
         self.rva: int = metadata_rva + stream_struct.Offset
         self.file_offset: Optional[int] = None
         self.__data__: bytes = stream_data
+        # one view over the stream data, sliced by the get_data_view_*() methods without copying.
+        self._data_view = memoryview(stream_data)
         self._stream_table_entry_size = stream_struct.sizeof()
         self._data_size = len(stream_data)
+        self._lazy_loader: Optional[Callable[[], None]] = None
 
     def parse(self, streams: List, lazy_load: bool = False):
         """
@@ -76,6 +86,21 @@ class ClrStream(abc.ABC):
         """
         pass
 
+    def setup_lazy_load(self, loader: Callable[[], None]):
+        """Mark this stream for lazy-parsing.
+
+        `loader` will be called, once, when data set by `parse()` is first requested
+        or when `force_parse()` is called.
+        """
+        self._lazy_loader = loader
+
+    def force_parse(self):
+        """If parsing of this stream was deferred, parse it now."""
+        loader = self._lazy_loader
+        if loader is not None:
+            self._lazy_loader = None
+            loader()
+
     def stream_table_entry_size(self):
         """
         Returns the number of bytes occupied by this entry in the Streams table list.
@@ -108,13 +133,28 @@ class ClrStream(abc.ABC):
         offset = rva - self.rva
         return self.get_data_at_offset(offset, size)
 
+    def get_data_view_at_offset(self, offset, size) -> memoryview:
+        """
+        Like get_data_at_offset(), but return a memoryview into the stream data, rather than a copy.
+        Useful for large ranges that are only read piecewise, such as the rows of a metadata table.
+        """
+        if size == 0 or offset >= self.sizeof():
+            return self._data_view[0:0]
+        return self._data_view[offset:offset + size]
+
+    def get_data_view_at_rva(self, rva, size) -> memoryview:
+        """
+        Like get_data_at_rva(), but return a memoryview into the stream data, rather than a copy.
+        """
+        offset = rva - self.rva
+        return self.get_data_view_at_offset(offset, size)
+
     def get_dword_at_rva(self, rva):
-        d = self.get_data_at_rva(rva, 4)
-        if len(d) < 4:
+        # read in place, rather than through get_data_at_rva() and a copy of the four bytes.
+        offset = rva - self.rva
+        if offset < 0 or offset + 4 > self._data_size:
             return None
-        # Little-endian
-        i = _struct.unpack("<I", d)[0]
-        return i
+        return _DWORD.unpack_from(self.__data__, offset)[0]
 
 
 class HeapItem(abc.ABC):
@@ -129,8 +169,11 @@ class HeapItem(abc.ABC):
     Each heap stream .get() call returns a subclass with these
     and optionally additional members.
     """
+    # there is one of these per heap lookup, so keep the common members in slots.
+    # subclasses that declare no __slots__ still get an instance dict for any additional members.
+    __slots__ = ("rva", "__data__")
 
-    rva: Optional[int] = None
+    rva: Optional[int]
     # original data from file
     __data__: bytes
     # interpreted value
@@ -202,6 +245,27 @@ class MDTableRow(abc.ABC):
     A Metadata Table row is a simple structure that holds the
     fields and values.
     """
+    # there is one instance per row, so keep the attributes every row has in slots.
+    # the attributes resolved by the parsing strategies below are named by each subclass,
+    # and set dynamically, so they still go in the instance dict.
+    __slots__ = (
+        "__dict__",
+        "_loaded",
+        "_tables_rowcnt",
+        "_strings",
+        "_guids",
+        "_blobs",
+        "_str_offsz",
+        "_guid_offsz",
+        "_blob_offsz",
+        "_format",
+        "_field_names",
+        "_unpacker",
+        "struct",
+        "row_size",
+        "_full_loader",
+    )
+
     #
     # required properties for subclasses.
     #
@@ -249,15 +313,38 @@ class MDTableRow(abc.ABC):
     #  - indexes: resolve via given table name
     #  - lists: resolve many items via given table name
     #  - codedindexes: resolve via candidate list of tables
-    _struct_strings: Dict[str, str]
-    _struct_guids: Dict[str, str]
-    _struct_blobs: Dict[str, str]
-    _struct_asis: Dict[str, str]
-    _struct_codedindexes: Dict[str, Tuple[str, Type["CodedIndex"]]]  # also CodedIndex subclass
-    _struct_indexes: Dict[str, Tuple[str, str]]                      # also Metadata table name
-    _struct_flags: Dict[str, Tuple[str, Type[enums.ClrFlags]]]       # also ClrFlags subclass
-    _struct_enums: Dict[str, Tuple[str, Type[enum.IntEnum]]]         # also enum.IntEnum subclassA
-    _struct_lists: Dict[str, Tuple[str, str]]                        # also Metadata table name
+    #
+    # each defaults to empty, so a strategy a subclass doesn't use simply has nothing to resolve.
+    _struct_strings: Dict[str, str] = {}
+    _struct_guids: Dict[str, str] = {}
+    _struct_blobs: Dict[str, str] = {}
+    _struct_asis: Dict[str, str] = {}
+    _struct_codedindexes: Dict[str, Tuple[str, Type["CodedIndex"]]] = {}  # also CodedIndex subclass
+    _struct_indexes: Dict[str, Tuple[str, str]] = {}                      # also Metadata table name
+    _struct_flags: Dict[str, Tuple[str, Type[enums.ClrFlags]]] = {}       # also ClrFlags subclass
+    _struct_enums: Dict[str, Tuple[str, Type[enum.IntEnum]]] = {}         # also enum.IntEnum subclassA
+    _struct_lists: Dict[str, Tuple[str, str]] = {}                        # also Metadata table name
+
+    # the strategies above, flattened when the subclass is defined. see `_row_class_parse_plan`.
+    _parse_plan: Tuple[Tuple[Callable, str, str, Any], ...] = ()
+    _parse_plan_tables: Tuple[Tuple[Callable, str, str, Any], ...] = ()
+    # the entries of `_parse_plan`, by attribute name, to lazy-load a single property.
+    _parse_plan_by_attr: Dict[str, Tuple[Callable, str, str, Any]] = {}
+
+    # the properties that a row of the class *could* have, along with their associated struct type,
+    # also computed when the subclass is defined. see `_row_class_struct_attrs`.
+    # these are used to determine what _parse function needs to be called to lazy-load the property.
+    _class_struct_attrs: Dict[str, str] = {}
+    _class_struct_attrs_tables: Dict[str, str] = {}
+
+    # the sizing and format entry of the most recently constructed row of the class. see `__init__`.
+    _row_format_memo: Optional[Tuple[type, Tuple[int, int, int], List[Optional[int]], List[Optional[int]], Tuple]] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._parse_plan, cls._parse_plan_tables = _row_class_parse_plan(cls)
+        cls._parse_plan_by_attr = {entry[2]: entry for entry in cls._parse_plan}
+        cls._class_struct_attrs, cls._class_struct_attrs_tables = _row_class_struct_attrs(cls)
 
     def __init__(
         self,
@@ -290,13 +377,59 @@ class MDTableRow(abc.ABC):
         self._str_offsz = strings_offset_size
         self._guid_offsz = guid_offset_size
         self._blob_offsz = blob_offset_size
-        self._format = self._compute_format()
-        self._data: bytes = b""
+
+        # every row of a table has the same format,
+        # so compute it, and the structures derived from it, only once per sizing.
+        cls = self.__class__
+        offset_sizes = (strings_offset_size, guid_offset_size, blob_offset_size)
+        memo = cls._row_format_memo
+        if (
+            memo is not None
+            and memo[0] is cls
+            and memo[1] == offset_sizes
+            and memo[2] is tables_rowcounts
+            and memo[3] == tables_rowcounts
+        ):
+            # the rows of a table are constructed one after another with the same arguments,
+            # and comparing against the previous row's sizing is cheaper than building and hashing the cache key.
+            self._format, template, self._field_names, self.row_size, self._unpacker = memo[4]
+        else:
+            self._format, template, self._field_names, self.row_size, self._unpacker = self._lookup_format(
+                offset_sizes, tables_rowcounts
+            )
 
         # we are cheating here: this isn't technically a RowStruct, but actually a RowStruct subclass.
         # but few users will likely reach in here, so ATM its not worth fully type annotating.
-        self.struct: RowStruct = self.__class__._struct_class(format=self._format)
-        self.row_size: int = self.struct.sizeof()
+        # copy the template rather than constructing (and re-parsing the format of) a new struct.
+        self.struct: RowStruct = template.__class__.__new__(template.__class__)
+        self.struct.__dict__.update(template.__dict__)
+
+    def _lookup_format(self, offset_sizes: Tuple[int, int, int], tables_rowcounts: List[Optional[int]]):
+        """
+        Return the row format, and the template struct, field names, row size, and unpacker derived from it,
+        for this row's class and sizing, computing them on a cache miss.
+        """
+        cls = self.__class__
+        cache_key = (cls,) + offset_sizes + (tuple(tables_rowcounts),)
+        cached = _row_format_cache.get(cache_key)
+        if cached is None:
+            row_format = self._compute_format()
+            template = cls._struct_class(format=row_format)
+            cached = (
+                row_format,
+                template,
+                _struct_field_names(template),
+                template.sizeof(),
+                # compiled once per format and shared by all rows with that format.
+                _row_unpacker(_struct_format(row_format)),
+            )
+            if len(_row_format_cache) >= _ROW_FORMAT_CACHE_SIZE:
+                _row_format_cache.clear()
+            _row_format_cache[cache_key] = cached
+        # keep a copy of the row counts, in case the caller's list is changed later.
+        # subclasses inherit the attribute, so also note which class this is for.
+        cls._row_format_memo = (cls, offset_sizes, tables_rowcounts, list(tables_rowcounts), cached)
+        return cached
 
     @abc.abstractmethod
     def _compute_format(self) -> Tuple[str, Sequence[str]]:
@@ -308,16 +441,41 @@ class MDTableRow(abc.ABC):
         """
         ...
 
-    def set_data(self, data: bytes, file_offset: Optional[int] = None):
+    def set_data(self, data: Union[bytes, memoryview], file_offset: Optional[int] = None):
         """
         Parse the data and set struct for this row.
 
         NOTE that the row is not fully parsed, and attributes not set, until
         parse() is called after all tables have had parse_rows() called on them.
         """
-        self._data = data
-        self.struct = self.__class__._struct_class(format=self._format, file_offset=file_offset)
-        self.struct.__unpack__(data)
+        if len(data) < self.row_size:
+            # let pefile raise its usual error for truncated data.
+            self.struct.__unpack__(data)
+        self._set_unpacked_data(self._unpacker.unpack_from(data), file_offset=file_offset)
+
+    def _set_unpacked_data(self, values: Tuple[Any, ...], file_offset: Optional[int] = None):
+        """
+        Set struct for this row from values already unpacked from the row data,
+        for example when the table decodes all of its rows at once.
+
+        This is equivalent to set_data(), without unpacking the data again.
+        The row does not keep the data: the table holds it for all of its rows.
+        """
+        # the struct was already built for this format in __init__,
+        # so fill it in place rather than constructing a new one per row.
+        struct = self.struct
+        struct.__file_offset__ = file_offset
+        # row formats are made of integer fields only, without padding,
+        # so the data is all zeroes exactly when all the values are zero.
+        struct.__all_zeroes__ = not any(values)
+        struct.__unpacked_data_elms__ = values
+        if self._field_names is not None:
+            # set all fields in one go, like __unpack__ would one by one.
+            struct.__dict__.update(zip(self._field_names, values))
+        else:
+            for keys, value in zip(struct.__keys__, values):
+                for key in keys:
+                    setattr(struct, key, value)
 
     # can be safely parsed without all tables being initialized
     CLASS_ATTRS = (
@@ -340,24 +498,20 @@ class MDTableRow(abc.ABC):
             return
         self._loaded = LoadState.LazyLoaded
         self._full_loader = full_loader
-        # Retrieve the properties that this row *could* have, along with
-        # their associated struct type. These are used to determine what
-        # _parse function needs to be called to load the property.
-        self._class_struct_attrs, self._class_struct_attrs_tables = (
-            _row_class_struct_attrs(self.__class__)
-        )
 
     def __getattr__(self, attr):
-        """If this row is marked for lazy-loading, attempt to load the struct
-        that contains the requested property and try again.
+        """If this row is marked for lazy-loading, attempt to load the requested
+        property and try again.
 
         If the requested property requires data from other
         mdtables, all tables will be loaded.
         """
         if self._loaded == LoadState.LazyLoaded:
             if attr in self._class_struct_attrs:
-                loader = getattr(self, "_parse" + self._class_struct_attrs[attr])
-                loader()
+                # resolve just the requested property, not every other one parsed with the same strategy,
+                # since callers often read only a few properties of each row.
+                resolve, struct_name, attr_name, extra = self._parse_plan_by_attr[attr]
+                resolve(self, struct_name, self.struct.__dict__.get(struct_name), attr_name, extra)
                 # If something were to go wrong with loading the correct struct, this
                 # would cause a StackOverflow from recursive __getattr__ calls.
                 if hasattr(self, attr):
@@ -370,201 +524,250 @@ class MDTableRow(abc.ABC):
         # TODO: more descriptive exception?
         raise AttributeError(attr)
 
-    def parse(self, tables: List["ClrMetaDataTable"], next_row: Optional["MDTableRow"]):
+    def parse(
+        self,
+        tables: List["ClrMetaDataTable"],
+        next_row: Optional["MDTableRow"],
+        tables_by_name: Optional[Dict[str, "ClrMetaDataTable"]] = None,
+    ):
         """
         Parse the row data and set object attributes.  Should only be called after all rows of all tables
         have been initialized, i.e. parse_rows() has been called on each table in the tables list.
 
-            next_row    the next row in the table, used for row lists (e.g. FieldList, MethodList)
-        """
-        self._parse_struct_asis()
-        self._parse_struct_strings()
-        self._parse_struct_guids()
-        self._parse_struct_blobs()
-        self._parse_struct_flags()
-        self._parse_struct_enums()
-        self._parse_struct_codedindexes(tables, next_row)
-        self._parse_struct_indexes(tables, next_row)
-        self._parse_struct_lists(tables, next_row)
+            next_row        the next row in the table, used for row lists (e.g. FieldList, MethodList)
+            tables_by_name  optional map of table name to table, built from `tables` if not given.
+                            callers parsing many rows should build it once and pass it to each row.
+        """
+        # the strategies are the same for every row of a class,
+        # so walk the plan flattened for the class instead of re-checking each strategy dict.
+        # read the raw fields straight from the struct's instance dict, where pefile sets them.
+        fields = self.struct.__dict__
+        for resolve, struct_name, attr_name, extra in self._parse_plan:
+            resolve(self, struct_name, fields.get(struct_name), attr_name, extra)
+        if tables and self._parse_plan_tables:
+            if tables_by_name is None:
+                tables_by_name = {t.name: t for t in tables}
+            for resolve, struct_name, attr_name, extra in self._parse_plan_tables:
+                resolve(self, struct_name, fields.get(struct_name), attr_name, extra, tables, next_row, tables_by_name)
         self._loaded = LoadState.Loaded
 
     def _parse_struct_asis(self):
         # if there are any fields to copy as-is
-        if hasattr(self.__class__, "_struct_asis"):
-            for struct_name, attr_name in self.__class__._struct_asis.items():
-                # always define attribute, even if failed to parse
-                setattr(self, attr_name, getattr(self.struct, struct_name, None))
+        fields = self.struct.__dict__
+        for struct_name, attr_name in self._struct_asis.items():
+            self._resolve_asis(struct_name, fields.get(struct_name), attr_name, None)
 
     def _parse_struct_strings(self):
         # if strings
-        if hasattr(self.__class__, "_struct_strings"):
-            for struct_name, attr_name in self.__class__._struct_strings.items():
-                # always define attribute, even if failed to parse
-                setattr(self, attr_name, None)
-                if self._strings is None:
-                    logger.warning("failed to fetch string: no strings table")
-                    continue
-
-                i = getattr(self.struct, struct_name, None)
-                try:
-                    s = self._strings.get(i)
-                    setattr(self, attr_name, s)
-                except UnicodeDecodeError:
-                    s = self._strings.get(i, as_bytes=True)
-                    logger.warning("string: invalid encoding")
-                    setattr(self, attr_name, s)
-                except IndexError:
-                    logger.warning("failed to fetch string: unable to parse data")
+        fields = self.struct.__dict__
+        for struct_name, attr_name in self._struct_strings.items():
+            self._resolve_string(struct_name, fields.get(struct_name), attr_name, None)
 
     def _parse_struct_guids(self):
         # if guids
-        if hasattr(self.__class__, "_struct_guids"):
-            for struct_name, attr_name in self.__class__._struct_guids.items():
-                # always define attribute, even if failed to parse
-                setattr(self, attr_name, None)
-                if self._guids is None:
-                    logger.warning("failed to fetch guid: no guid table")
-                    continue
-
-                try:
-                    g = self._guids.get(getattr(self.struct, struct_name, None))
-                    setattr(self, attr_name, g)
-                except (IndexError, TypeError):
-                    logger.warning("failed to fetch guid: unable to parse data")
+        fields = self.struct.__dict__
+        for struct_name, attr_name in self._struct_guids.items():
+            self._resolve_guid(struct_name, fields.get(struct_name), attr_name, None)
 
     def _parse_struct_blobs(self):
         # if blobs
-        if hasattr(self.__class__, "_struct_blobs"):
-            for struct_name, attr_name in self.__class__._struct_blobs.items():
-                # always define attribute, even if failed to parse
-                setattr(self, attr_name, None)
-                if self._blobs is None:
-                    logger.warning("failed to fetch blob: no blob table")
-                    continue
-                try:
-                    b = self._blobs.get(getattr(self.struct, struct_name, None))
-                    setattr(self, attr_name, b)
-                except (IndexError, TypeError):
-                    logger.warning("failed to fetch blob: unable to parse data")
+        fields = self.struct.__dict__
+        for struct_name, attr_name in self._struct_blobs.items():
+            self._resolve_blob(struct_name, fields.get(struct_name), attr_name, None)
 
-    def _parse_struct_codedindexes(self, tables, next_row):
+    def _parse_struct_codedindexes(self, tables, next_row, tables_by_name=None):
         # if coded indexes
-        if hasattr(self.__class__, "_struct_codedindexes") and tables:
-            for struct_name, (
-                attr_name,
-                attr_class,
-            ) in self.__class__._struct_codedindexes.items():
-                # always define attribute, even if failed to parse
-                setattr(self, attr_name, None)
-                try:
-                    o = attr_class(getattr(self.struct, struct_name, None), tables)
-                    setattr(self, attr_name, o)
-                except (IndexError, TypeError):
-                    logger.warning("failed to fetch coded index: unable to parse data")
+        if not tables:
+            return
+        if tables_by_name is None:
+            tables_by_name = {t.name: t for t in tables}
+        fields = self.struct.__dict__
+        for struct_name, (attr_name, attr_class) in self._struct_codedindexes.items():
+            self._resolve_codedindex(
+                struct_name, fields.get(struct_name), attr_name, attr_class, tables, next_row, tables_by_name
+            )
 
     def _parse_struct_flags(self):
         # if flags
-        if hasattr(self.__class__, "_struct_flags"):
-            for struct_name, (attr_name, flag_class) in self.__class__._struct_flags.items():
-                # always define attribute, even if failed to parse
-                setattr(self, attr_name, None)
-                # Set the flags according to the Flags member
-                v = getattr(self.struct, struct_name, None)
-                if v is None:
-                    logger.warning("failed to fetch flag: no data")
-                    continue
-
-                try:
-                    setattr(self, attr_name, flag_class(v))
-                except ValueError:
-                    logger.warning("failed to fetch flag: invalid flag data")
+        fields = self.struct.__dict__
+        for struct_name, (attr_name, flag_class) in self._struct_flags.items():
+            self._resolve_flags(struct_name, fields.get(struct_name), attr_name, flag_class)
 
     def _parse_struct_enums(self):
         # if enums
-        if hasattr(self.__class__, "_struct_enums"):
-            for struct_name, (attr_name, enum_class) in self.__class__._struct_enums.items():
-                # always define attribute, even if failed to parse
-                setattr(self, attr_name, None)
-                # Set the value according to the Enum member
-                v = getattr(self.struct, struct_name, None)
-                if v is None:
-                    logger.warning("failed to fetch enum: no data")
-                    continue
+        fields = self.struct.__dict__
+        for struct_name, (attr_name, enum_class) in self._struct_enums.items():
+            self._resolve_enum(struct_name, fields.get(struct_name), attr_name, enum_class)
 
-                try:
-                    setattr(self, attr_name, enum_class(v))
-                except ValueError:
-                    logger.warning("failed to fetch enum: invalid enum data")
-
-    def _parse_struct_indexes(self, tables, next_row):
+    def _parse_struct_indexes(self, tables, next_row, tables_by_name=None):
         # if indexes
-        if hasattr(self.__class__, "_struct_indexes") and tables:
-            for struct_name, (attr_name, table_name) in self.__class__._struct_indexes.items():
-                # always define attribute, even if failed to parse
-                setattr(self, attr_name, None)
-
-                table = None
-                for t in tables:
-                    if t.name == table_name:
-                        table = t
-                if table:
-                    i = getattr(self.struct, struct_name, None)
-                    if i is not None and i > 0 and i <= table.num_rows:
-                        setattr(self, attr_name, MDTableIndex(table, i))
-                    else:
-                        logger.warning("failed to fetch index reference: unable to parse data")
-
-    def _parse_struct_lists(self, tables, next_row):
+        if not tables:
+            return
+        if tables_by_name is None:
+            tables_by_name = {t.name: t for t in tables}
+        fields = self.struct.__dict__
+        for struct_name, (attr_name, table_name) in self._struct_indexes.items():
+            self._resolve_index(struct_name, fields.get(struct_name), attr_name, table_name, tables, next_row, tables_by_name)
+
+    def _parse_struct_lists(self, tables, next_row, tables_by_name=None):
         # if lists
-        if hasattr(self.__class__, "_struct_lists") and tables:
-            for struct_name, (attr_name, table_name) in self.__class__._struct_lists.items():
-
-                table = None
-                for t in tables:
-                    if t.name == table_name:
-                        table = t
-
-                run: List[MDTableIndex] = []
-                # always define attribute, even if failed to parse
-                setattr(self, attr_name, run)
-
-                if not table:
-                    # target table is not present,
-                    # such as is there is no Field table in hello-world.exe,
-                    # so the references below must, by defintion, be empty.
-                    continue
-
-                run_start_index = getattr(self.struct, struct_name, None)
-                if run_start_index is not None:
-                    max_row = table.num_rows
-                    if next_row is not None:
-                        # then we read from the target table,
-                        # from the row referenced by this row,
-                        # until the row referenced by the next row (`next_row`),
-                        # or the end of the table.
-                        next_row_reference = getattr(next_row.struct, struct_name, None)
-                        run_end_index = max_row
-                        if next_row_reference is not None:
-                            # row end index is inclusive so row end index must equal next row index minus 1, if less than max row
-                            run_end_index = min(next_row_reference - 1, max_row)
-
-                    else:
-                        # then we read from the target table,
-                        # from the row referenced by this row,
-                        # until the end of the table.
-                        run_end_index = max_row
-
-                    # when this run starts at the last index,
-                    # start == end and end == max_row.
-                    # otherwise, if start == end, then run is empty.
-                    if run_start_index <= run_end_index:
-                        # row indexes are inclusive, so our range goes to end+1
-                        for row_index in range(run_start_index, run_end_index + 1):
-                            run.append(MDTableIndex(table, row_index))
-
-                setattr(self, attr_name, run)
-
-    def _table_name2num(self, name, tables: List["ClrMetaDataTable"]):
+        if not tables:
+            return
+        if tables_by_name is None:
+            tables_by_name = {t.name: t for t in tables}
+        fields = self.struct.__dict__
+        for struct_name, (attr_name, table_name) in self._struct_lists.items():
+            self._resolve_list(struct_name, fields.get(struct_name), attr_name, table_name, tables, next_row, tables_by_name)
+
+    #
+    # resolvers for a single field, one per parsing strategy.
+    #
+    # each takes the raw struct field name and its value, the row attribute name,
+    # and the strategy's extra value (e.g. flags class or table name), if any.
+    # resolvers of strategies that reference other tables also take
+    # the tables list, the next row, and the map of table name to table.
+    #
+
+    def _resolve_asis(self, struct_name, value, attr_name, _):
+        # always define attribute, even if failed to parse
+        setattr(self, attr_name, value)
+
+    def _resolve_string(self, struct_name, value, attr_name, _):
+        # always define attribute, even if failed to parse
+        setattr(self, attr_name, None)
+        if self._strings is None:
+            logger.warning("failed to fetch string: no strings table")
+            return
+
+        try:
+            s = self._strings.get(value)
+            setattr(self, attr_name, s)
+        except UnicodeDecodeError:
+            s = self._strings.get(value, as_bytes=True)
+            logger.warning("string: invalid encoding")
+            setattr(self, attr_name, s)
+        except IndexError:
+            logger.warning("failed to fetch string: unable to parse data")
+
+    def _resolve_guid(self, struct_name, value, attr_name, _):
+        # always define attribute, even if failed to parse
+        setattr(self, attr_name, None)
+        if self._guids is None:
+            logger.warning("failed to fetch guid: no guid table")
+            return
+
+        try:
+            g = self._guids.get(value)
+            setattr(self, attr_name, g)
+        except (IndexError, TypeError):
+            logger.warning("failed to fetch guid: unable to parse data")
+
+    def _resolve_blob(self, struct_name, value, attr_name, _):
+        # always define attribute, even if failed to parse
+        setattr(self, attr_name, None)
+        if self._blobs is None:
+            logger.warning("failed to fetch blob: no blob table")
+            return
+        try:
+            b = self._blobs.get(value)
+            setattr(self, attr_name, b)
+        except (IndexError, TypeError):
+            logger.warning("failed to fetch blob: unable to parse data")
+
+    def _resolve_flags(self, struct_name, value, attr_name, flag_class):
+        # always define attribute, even if failed to parse
+        setattr(self, attr_name, None)
+        # Set the flags according to the Flags member
+        if value is None:
+            logger.warning("failed to fetch flag: no data")
+            return
+
+        try:
+            setattr(self, attr_name, _flags_instance(flag_class, value))
+        except ValueError:
+            logger.warning("failed to fetch flag: invalid flag data")
+
+    def _resolve_enum(self, struct_name, value, attr_name, enum_class):
+        # always define attribute, even if failed to parse
+        setattr(self, attr_name, None)
+        # Set the value according to the Enum member
+        if value is None:
+            logger.warning("failed to fetch enum: no data")
+            return
+
+        try:
+            setattr(self, attr_name, enum_class(value))
+        except ValueError:
+            logger.warning("failed to fetch enum: invalid enum data")
+
+    def _resolve_codedindex(self, struct_name, value, attr_name, attr_class, tables, next_row, tables_by_name=None):
+        # always define attribute, even if failed to parse
+        setattr(self, attr_name, None)
+        try:
+            o = attr_class(value, tables, tables_by_name)
+            setattr(self, attr_name, o)
+        except (IndexError, TypeError):
+            logger.warning("failed to fetch coded index: unable to parse data")
+
+    def _resolve_index(self, struct_name, value, attr_name, table_name, tables, next_row, tables_by_name):
+        # always define attribute, even if failed to parse
+        setattr(self, attr_name, None)
+
+        table = tables_by_name.get(table_name)
+        if table:
+            if value is not None and value > 0 and value <= table.num_rows:
+                setattr(self, attr_name, MDTableIndex(table, value))
+            else:
+                logger.warning("failed to fetch index reference: unable to parse data")
+
+    def _resolve_list(self, struct_name, value, attr_name, table_name, tables, next_row, tables_by_name):
+        table = tables_by_name.get(table_name)
+
+        run: List[MDTableIndex] = []
+        # always define attribute, even if failed to parse.
+        # the run is filled in place below, so this is the only assignment.
+        setattr(self, attr_name, run)
+
+        if not table:
+            # target table is not present,
+            # such as is there is no Field table in hello-world.exe,
+            # so the references below must, by defintion, be empty.
+            return
+
+        run_start_index = value
+        if run_start_index is not None:
+            max_row = table.num_rows
+            if next_row is not None:
+                # then we read from the target table,
+                # from the row referenced by this row,
+                # until the row referenced by the next row (`next_row`),
+                # or the end of the table.
+                next_row_reference = next_row.struct.__dict__.get(struct_name)
+                run_end_index = max_row
+                if next_row_reference is not None:
+                    # row end index is inclusive so row end index must equal next row index minus 1, if less than max row
+                    run_end_index = min(next_row_reference - 1, max_row)
+
+            else:
+                # then we read from the target table,
+                # from the row referenced by this row,
+                # until the end of the table.
+                run_end_index = max_row
+
+            # when this run starts at the last index,
+            # start == end and end == max_row.
+            # otherwise, if start == end, then run is empty.
+            if run_start_index <= run_end_index:
+                # row indexes are inclusive, so our range goes to end+1.
+                # build the whole run in one go, rather than appending index by index.
+                run.extend(map(MDTableIndex, _itertools.repeat(table), range(run_start_index, run_end_index + 1)))
+
+    def _table_name2num(
+        self, name, tables: List["ClrMetaDataTable"], tables_by_name: Optional[Dict[str, "ClrMetaDataTable"]] = None
+    ):
+        if tables_by_name is not None:
+            table = tables_by_name.get(name)
+            return table.number if table is not None else None
         for t in tables:
             if t.name == name:
                 return t.number
@@ -579,22 +782,15 @@ class MDTableRow(abc.ABC):
         The returned character can be used in a Structure format or
         passing to struct.pack()
         """
-        max_index = 0
-        for name in table_names:
-            if not name:
-                continue
-
-            table_index = enums.MetadataTables[name].value
-            table_rowcnt = self._tables_rowcnt[table_index]
-            if table_rowcnt is None:
-                # the requested table is not present,
-                # so it effectively has zero rows.
-                table_rowcnt = 0
-
-            max_index = max(max_index, table_rowcnt)
+        tables_rowcnt = self._tables_rowcnt
+        # a table that is not present (row count None) effectively has zero rows.
+        max_index = max(
+            (tables_rowcnt[_TABLE_NUMBERS[name]] or 0 for name in table_names if name),
+            default=0,
+        )
 
         # if it can fit in a word (minus bits for reference id)
-        if max_index <= 2 ** (16 - tag_bits):
+        if max_index <= 1 << (16 - tag_bits):
             # size is a word
             return "H"
         else:
@@ -602,15 +798,92 @@ class MDTableRow(abc.ABC):
             return "I"
 
 
-# Computing this for each class takes some time, especially if it is done for every row,
-# but it *should* remain consistent for any given class and therefore can be cached.
-@_functools.lru_cache(None)
+# row formats, and the template struct, field names, row size, and unpacker derived from each,
+# keyed by row class and heap/table sizing.
+# the sizing differs per file, so bound the cache when many files are loaded.
+_ROW_FORMAT_CACHE_SIZE = 1024
+_row_format_cache: Dict[
+    Tuple, Tuple[Tuple[str, Sequence[str]], RowStruct, Optional[Tuple[str, ...]], int, _struct.Struct]
+] = {}
+
+
+def _struct_field_names(struct: Structure) -> Optional[Tuple[str, ...]]:
+    """
+    Return the field name for each unpacked value of the struct,
+    or None if a value is assigned to more than one field (a union).
+    """
+    if any(len(keys) != 1 for keys in struct.__keys__):
+        return None
+    return tuple(keys[0] for keys in struct.__keys__)
+
+
+# flag values repeat heavily across the rows of a table, e.g. most methods share a few MethodAttributes,
+# so decode each distinct value once. flag objects are immutable, so rows with the same value share one.
+@_functools.lru_cache(maxsize=4096)
+def _flags_instance(flag_class: Type[enums.ClrFlags], value: int) -> enums.ClrFlags:
+    return flag_class(value)
+
+
+def _struct_format(row_format: Tuple[str, Sequence[str]]) -> str:
+    """
+    Return the struct module format string for a RowStruct format,
+    as pefile builds it, from the type of each "type,name" field.
+
+    pefile's own copy of it is stored under a different attribute name depending on its version.
+    """
+    return "<" + "".join(field.split(",", 1)[0] for field in row_format[1])
+
+
+@_functools.lru_cache(maxsize=None)
+def _row_unpacker(format_str: str) -> _struct.Struct:
+    """Return a compiled struct for the given RowStruct format string."""
+    return _struct.Struct(format_str)
+
+
+# parsing strategies, in the order they are applied, and the resolver used for each field.
+_PARSE_STRATEGIES = (
+    ("_struct_asis", "_resolve_asis"),
+    ("_struct_strings", "_resolve_string"),
+    ("_struct_guids", "_resolve_guid"),
+    ("_struct_blobs", "_resolve_blob"),
+    ("_struct_flags", "_resolve_flags"),
+    ("_struct_enums", "_resolve_enum"),
+)
+# strategies that cannot be resolved without all tables being initialized
+_PARSE_STRATEGIES_TABLES = (
+    ("_struct_codedindexes", "_resolve_codedindex"),
+    ("_struct_indexes", "_resolve_index"),
+    ("_struct_lists", "_resolve_list"),
+)
+
+
+def _row_class_parse_plan(cls: Type[MDTableRow]):
+    """Flatten the parsing strategies of a `MDTableRow` class into lists of
+    (resolver, struct field name, attribute name, extra) entries.
+
+    The first list can be resolved without data from any other tables; the second cannot.
+    Called once per class, when it is defined.
+    """
+    def flatten(strategies):
+        plan = []
+        for class_attr, resolver_name in strategies:
+            resolver = getattr(cls, resolver_name)
+            for struct_name, attr in getattr(cls, class_attr, {}).items():
+                attr_name, extra = attr if isinstance(attr, tuple) else (attr, None)
+                plan.append((resolver, struct_name, attr_name, extra))
+        return tuple(plan)
+
+    return flatten(_PARSE_STRATEGIES), flatten(_PARSE_STRATEGIES_TABLES)
+
+
 def _row_class_struct_attrs(cls: Type[MDTableRow]):
     """Retrieve all possible attributes for a `MDTableRow` class,
     along with their associated struct type.
 
     Attributes are separated based on whether they can be loaded without data from
     any other tables.
+    Computing this takes some time, but it remains consistent for any given class,
+    so it is called once per class, when it is defined.
     """
     attrs = {
         attr[0] if isinstance(attr, tuple) else attr: struct
@@ -658,6 +931,11 @@ class MDTableIndex(Generic[RowType]):
         row_index       Index number of the row.
         row             The referenced row.
     """
+    # there may be many of these per table row (e.g. in FieldList, MethodList),
+    # so don't give each instance a __dict__.
+    # subclasses should define __slots__ too, otherwise instances get one anyway.
+    __slots__ = ("table", "row_index")
+
     def __init__(self, table: "ClrMetaDataTable[RowType]", row_index: int):
         self.table: Optional["ClrMetaDataTable[RowType]"] = table
         self.row_index: int = row_index
@@ -666,6 +944,10 @@ class MDTableIndex(Generic[RowType]):
     def row(self) -> Optional[RowType]:
         if self.table is None:
             return None
+        elif self.row_index < 1:
+            # row indexes are 1-based, and zero is a null reference, e.g. the Extends of <Module>.
+            # don't let it wrap around to the last row of the table.
+            return None
         else:
             return self.table.get_with_row_index(self.row_index)
 
@@ -688,16 +970,39 @@ class CodedIndex(MDTableIndex[RowType]):
     #       tag_bits = 2
     #       table_names = ("TypeDef", "TypeRef", "TypeSpec")
     #
+    __slots__ = ()
+
     tag_bits: int
     table_names: Sequence[str]
 
-    def __init__(self, value, tables: List["ClrMetaDataTable[RowType]"]):
-        assert hasattr(self, "tag_bits")
-        assert hasattr(self, "table_names")
+    # derived from tag_bits when the subclass is defined.
+    _tag_mask: int
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if hasattr(cls, "tag_bits"):
+            cls._tag_mask = (1 << cls.tag_bits) - 1
 
-        table_name = self.table_names[value & (2 ** self.tag_bits - 1)]
+    def __init__(
+        self,
+        value,
+        tables: List["ClrMetaDataTable[RowType]"],
+        tables_by_name: Optional[Dict[str, "ClrMetaDataTable[RowType]"]] = None,
+    ):
+        """
+        Decode the coded index `value` and find the referenced table in `tables`.
+        `tables_by_name`, a map of table name to table, may be given to avoid scanning `tables`.
+        """
+        # _tag_mask is only set for subclasses that define tag_bits,
+        # so an incomplete subclass fails here with an AttributeError.
+        table_name = self.table_names[value & self._tag_mask]
         self.row_index = value >> self.tag_bits
 
+        if tables_by_name is not None:
+            # this may be None, which may not be a problem, e.g. when ManifestResource Implementation=0
+            self.table = tables_by_name.get(table_name)
+            return
+
         for t in tables:
             if t.name != table_name:
                 continue
@@ -780,27 +1085,35 @@ class ClrMetaDataTable(Generic[RowType]):
         self.is_sorted: bool = is_sorted
         self.num_rows: int = num_rows
 
-        def init_row():
-            return self._row_class(
-                tables_rowcounts,
-                strings_offset_size,
-                guid_offset_size,
-                blob_offset_size,
-                strings_heap,
-                guid_heap,
-                blob_heap,
-            )
+        # every row is constructed with the same arguments, so bind them once.
+        # this is also used to construct rows on first access, when lazy-loading.
+        init_row = self._init_row = _functools.partial(
+            self._row_class,
+            tables_rowcounts,
+            strings_offset_size,
+            guid_offset_size,
+            blob_offset_size,
+            strings_heap,
+            guid_heap,
+            blob_heap,
+        )
 
         self.rows: List[RowType]
+        row_size = 0
+        first_row: Optional[RowType] = None
         if lazy_load and num_rows > 0:
-            self.rows = _LazyList(self._lazy_parse_rows, num_rows)
             try:
-                # `_get_row_size` uses the size of the first row.
-                self.rows[0] = init_row()
+                # rows are only constructed when first accessed, see `_lazy_parse_row`.
+                # construct one up front just to learn the row size and check the format is valid,
+                # but don't keep it, since it would be replaced on first access anyway.
+                probe_row = init_row()
+                first_row, row_size = probe_row, probe_row.row_size
             except errors.dnFormatError:
                 logger.warning("failed to construct %s row %d", self.name, 0)
                 # "truncate" the list since the following data is assumed invalid.
                 self.rows = []
+            else:
+                self.rows = _LazyList(self._lazy_parse_rows, num_rows)
         else:
             self.rows = []
             for e in range(num_rows):
@@ -810,6 +1123,17 @@ class ClrMetaDataTable(Generic[RowType]):
                     # this may occur when the offset to a stream is too large.
                     # this probably means invalid data.
                     logger.warning("failed to construct %s row %d", self.name, e)
+            if self.rows:
+                # every row of the table has the same size.
+                first_row = self.rows[0]
+                row_size = first_row.row_size
+
+        # all rows share one format, so keep what is needed to decode row data without any rows.
+        self._row_unpacker: Optional[_struct.Struct] = None
+        self._row_field_names: Optional[Tuple[str, ...]] = None
+        if first_row is not None:
+            self._row_unpacker = first_row._unpacker
+            self._row_field_names = first_row._field_names
 
         # store heap info
         self._strings_heap: Optional["stream.StringsHeap"] = strings_heap
@@ -820,16 +1144,10 @@ class ClrMetaDataTable(Generic[RowType]):
         self._blob_offset_size = blob_offset_size
         self._tables_rowcounts = tables_rowcounts
 
-        self._table_data: bytes = b""
-        self.row_size: int = self._get_row_size()
+        self._table_data: memoryview = memoryview(b"")
+        self.row_size: int = row_size
 
-    def _get_row_size(self):
-        if not self.rows:
-            return 0
-        r = self.rows[0]
-        return r.row_size
-
-    def setup_lazy_load(self, table_rva: int, data: bytes, full_loader):
+    def setup_lazy_load(self, table_rva: int, data: Union[bytes, memoryview], full_loader):
         """Mark this table for lazy-loading.
 
         `full_loader` will be called if a row property is requested that requires
@@ -838,7 +1156,8 @@ class ClrMetaDataTable(Generic[RowType]):
         if not self._loaded == LoadState.Unloaded:
             return
         self.rva = table_rva
-        self._table_data = data
+        # rows are sliced out of this as they are accessed, so make those slices views, not copies.
+        self._table_data = memoryview(data)
         self._full_loader = full_loader
         if len(data) < self.row_size * self.num_rows:
             logger.warning("not enough data to parse %d rows", self.num_rows)
@@ -852,15 +1171,7 @@ class ClrMetaDataTable(Generic[RowType]):
             return row
 
         try:
-            row = self._row_class(
-                self._tables_rowcounts,
-                self._strings_offset_size,
-                self._guid_offset_size,
-                self._blob_offset_size,
-                self._strings_heap,
-                self._guid_heap,
-                self._blob_heap,
-            )
+            row = self._init_row()
         except errors.dnFormatError:
             # this may occur when the offset to a stream is too large.
             # this probably means invalid data.
@@ -872,13 +1183,15 @@ class ClrMetaDataTable(Generic[RowType]):
             return None
 
         row.setup_lazy_load(self._full_loader)
-        offset = self.row_size * idx
-        if len(self._table_data) < offset + self.row_size:
+        row_size = self.row_size
+        offset = row_size * idx
+        if len(self._table_data) < offset + row_size:
             logger.warning("not enough data to parse row %d", idx)
             # we could truncate here as well, but regular loading would still be
             # left with a full-length list in the equivalent situation.
             return row
-        row.set_data(self._table_data[offset:offset + self.row_size], file_offset=self.file_offset + offset)
+        # unpack the row straight out of the table data, like parse_rows() does, rather than slicing it first.
+        row._set_unpacked_data(row._unpacker.unpack_from(self._table_data, offset), file_offset=self.file_offset + offset)
         return row
 
     def _lazy_parse_rows(self, key, row):
@@ -888,16 +1201,20 @@ class ClrMetaDataTable(Generic[RowType]):
             return row
 
         if isinstance(key, slice):
-            # normally not knowing the length of the list a slice was taken from
-            # would be an issue, but we can just keep going until `row` is exhausted.
+            # resolve the slice against the length of the list it was taken from,
+            # so that negative and omitted bounds map to the right row indexes.
             return [
                 self._lazy_parse_row(row, i)
-                for row, i in zip(row, _itertools.count(key.start or 0, key.step or 1))
+                for row, i in zip(row, range(*key.indices(len(self.rows))))
             ]
 
+        # likewise map a negative index to its row, so the row's data and file offset
+        # are taken relative to the start of the table.
+        if key < 0:
+            key += len(self.rows)
         return self._lazy_parse_row(row, key)
 
-    def parse_rows(self, table_rva: int, data: bytes):
+    def parse_rows(self, table_rva: int, data: Union[bytes, memoryview]):
         """
         Given a byte sequence containing the rows, add data to each row in the
         self.rows list.  Note that the rows have not been fully parsed until
@@ -908,22 +1225,30 @@ class ClrMetaDataTable(Generic[RowType]):
             # will be handled by lazy evaluation during parse()
             return
 
-        self._table_data = data
+        # go through a memoryview, so that neither the rows nor each row's data are copied,
+        # even when the caller passes bytes.
+        view = memoryview(data)
+        self._table_data = view
         if len(data) < self.row_size * self.num_rows:
             logger.warning("not enough data to parse %d rows", self.num_rows)
             # we can still try to parse some of the rows...
 
-        offset = 0
-        # iterate through rows, stopping at num_rows or when there is not enough data left
-        for i in range(self.num_rows):
-            if len(data) < offset + self.row_size:
-                logger.warning("not enough data to parse row %d", i)
-                break
+        row_size = self.row_size
+        row_struct = self._row_unpacker
+        if not self.rows or not row_size or row_struct is None:
+            return
 
-            self.rows[i].set_data(
-                data[offset:offset + self.row_size], file_offset=self.file_offset + offset
-            )
-            offset += self.row_size
+        # stop at num_rows or when there is not enough data left for a full row
+        num_rows = min(self.num_rows, len(data) // row_size)
+        if num_rows < self.num_rows:
+            logger.warning("not enough data to parse row %d", num_rows)
+
+        # all rows of a table share the same format,
+        # so decode them all with the one compiled struct rather than unpacking row by row.
+        end = num_rows * row_size
+        file_offset = self.file_offset
+        for row, values, offset in zip(self.rows, row_struct.iter_unpack(view[:end]), range(0, end, row_size)):
+            row._set_unpacked_data(values, file_offset=file_offset + offset)
 
     def parse(self, tables: List["ClrMetaDataTable"]):
         """
@@ -933,17 +1258,54 @@ class ClrMetaDataTable(Generic[RowType]):
         NOTE: do not call until ALL tables have been initialized and parse_rows()
         called on each.
         """
+        # look up referenced tables by name once, rather than scanning the tables list for each row.
+        tables_by_name = {t.name: t for t in tables}
 
-        # for each row in table
-        for i, row in enumerate(self.rows):
-            next_row = None
-            if i + 1 < len(self.rows):
-                next_row = self.rows[i + 1]
-
+        # for each row in table, along with the row after it (or None, for the last row)
+        rows = self.rows
+        next_rows = _itertools.chain(_itertools.islice(rows, 1, None), (None,))
+        for row, next_row in zip(rows, next_rows):
             # fully parse the row
-            row.parse(tables, next_row=next_row)
+            row.parse(tables, next_row=next_row, tables_by_name=tables_by_name)
         self._loaded = LoadState.Loaded
 
+    def get_column(self, field_name: str) -> List[Any]:
+        """
+        Return the raw value of the given struct field, e.g. "TypeName_StringIndex",
+        for each row that has data, decoded straight from the table data.
+
+        No rows are constructed or parsed, so this is cheap for scanning one field
+        of a large table, including when lazy-loading.
+        """
+        # every struct field is named in one of the row class's parsing strategies,
+        # so an unknown field is reported even when the table has no rows to take the names from.
+        row_class = self._row_class
+        strategies = MDTableRow.CLASS_ATTRS + MDTableRow.CLASS_ATTRS_TABLES
+        if not any(field_name in getattr(row_class, strategy) for strategy in strategies):
+            raise KeyError(field_name)
+
+        names = self._row_field_names
+        if self._row_unpacker is None or names is None:
+            return []
+        if field_name not in names:
+            raise KeyError(field_name)
+
+        # every field is a single format character, so the field's offset is the size of those before it.
+        # decode just that field from each row by skipping over the others as padding,
+        # rather than unpacking whole rows and discarding all but one value.
+        row_size = self.row_size
+        codes = self._row_unpacker.format[1:]
+        field_index = names.index(field_name)
+        field_offset = _struct.calcsize("<" + codes[:field_index])
+        field_size = _struct.calcsize("<" + codes[field_index])
+        column_unpacker = _struct.Struct(
+            "<%dx%s%dx" % (field_offset, codes[field_index], row_size - field_offset - field_size)
+        )
+
+        data = self._table_data
+        num_rows = min(self.num_rows, len(data) // row_size)
+        return list(map(_operator.itemgetter(0), column_unpacker.iter_unpack(data[:num_rows * row_size])))
+
     def __getitem__(self, index: int) -> RowType:
         return self.rows[index]
 
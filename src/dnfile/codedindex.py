@@ -43,12 +43,16 @@ if TYPE_CHECKING:
 
 
 class TypeDefOrRef(CodedIndex[Union["TypeDefRow", "TypeRefRow", "TypeSpecRow"]]):
+    __slots__ = ()
+
     tag_bits = 2
     table_names = ("TypeDef", "TypeRef", "TypeSpec")
     table_numbers = (2, 1, 27)
 
 
 class HasConstant(CodedIndex[Union["FieldRow", "ParamRow", "PropertyRow"]]):
+    __slots__ = ()
+
     tag_bits = 2
     table_names = ("Field", "Param", "Property")
     table_numbers = (4, 8, 23)
@@ -81,6 +85,8 @@ class HasCustomAttribute(
         ]
     ]
 ):
+    __slots__ = ()
+
     tag_bits = 5
     # TODO this may be an incomplete list
     table_names = (
@@ -109,50 +115,70 @@ class HasCustomAttribute(
 
 
 class HasFieldMarshall(CodedIndex[Union["FieldRow", "ParamRow"]]):
+    __slots__ = ()
+
     tag_bits = 1
     table_names = ("Field", "Param")
 
 
 class HasDeclSecurity(CodedIndex[Union["TypeDefRow", "MethodDefRow", "AssemblyRow"]]):
+    __slots__ = ()
+
     tag_bits = 2
     table_names = ("TypeDef", "MethodDef", "Assembly")
 
 
 class MemberRefParent(CodedIndex[Union["TypeDefRow", "TypeRefRow", "ModuleRefRow", "MethodDefRow", "TypeSpecRow"]]):
+    __slots__ = ()
+
     tag_bits = 3
     table_names = ("TypeDef", "TypeRef", "ModuleRef", "MethodDef", "TypeSpec")
 
 
 class HasSemantics(CodedIndex[Union["EventRow", "PropertyRow"]]):
+    __slots__ = ()
+
     tag_bits = 1
     table_names = ("Event", "Property")
 
 
 class MethodDefOrRef(CodedIndex[Union["MethodDefRow", "MemberRefRow"]]):
+    __slots__ = ()
+
     tag_bits = 1
     table_names = ("MethodDef", "MemberRef")
 
 
 class MemberForwarded(CodedIndex[Union["FieldRow", "MethodDefRow"]]):
+    __slots__ = ()
+
     tag_bits = 1
     table_names = ("Field", "MethodDef")
 
 
 class Implementation(CodedIndex[Union["FileRow", "AssemblyRefRow", "ExportedTypeRow"]]):
+    __slots__ = ()
+
     tag_bits = 2
     table_names = ("File", "AssemblyRef", "ExportedType")
 
 
 class CustomAttributeType(CodedIndex[Union["MethodDefRow", "MemberRefRow"]]):
+    __slots__ = ()
+
     tag_bits = 3
     table_names = ("Unused", "Unused", "MethodDef", "MemberRef", "Unused")
 
 
 class ResolutionScope(CodedIndex[Union["ModuleRow", "ModuleRefRow", "AssemblyRefRow", "TypeRefRow"]]):
+    __slots__ = ()
+
     tag_bits = 2
     table_names = ("Module", "ModuleRef", "AssemblyRef", "TypeRef")
 
 
 class TypeOrMethodDef(CodedIndex[Union["TypeDefRow", "MethodDefRow"]]):
+    __slots__ = ()
+
     tag_bits = 1
     table_names = ("TypeDef", "MethodDef")
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import enum as _enum
-from typing import Dict, Type, Iterable
+from typing import Dict, Type, Tuple, Iterable, FrozenSet
 
 ########
 # Most developers may just use the Clr* classes to automatically parse the
@@ -10,10 +10,51 @@ from typing import Dict, Type, Iterable
 # The definitions in winsdk corhdr.h may be accesses through the Cor* classes.
 
 
-def _getvars(o):
-    for attr in dir(o):
-        if not callable(getattr(o, attr)) and not attr.startswith("_"):
-            yield attr
+def _bool_attr_names(cls, enum_classes: Iterable[Type[_enum.IntEnum]] = ()) -> Tuple[str, ...]:
+    """
+    Return the sorted names of the public bool attributes of `cls`, along with the
+    names of the members of `enum_classes`, which instances set as bool attributes.
+    """
+    names = {attr for attr in dir(cls) if not attr.startswith("_") and isinstance(getattr(cls, attr), bool)}
+    for enum_class in enum_classes:
+        names.update(m.name for m in enum_class)
+    return tuple(sorted(names))
+
+
+# the right-hand column of the flags reprs, which only ever holds one of two values.
+_REPR_VALUES = {False: "{:>8}".format(str(False)), True: "{:>8}".format(str(True))}
+
+
+class _MaskMember(object):
+    """
+    Flag attribute that is True when the masked flags value equals one enum member's value.
+    """
+    __slots__ = ("mask", "member_value")
+
+    def __init__(self, mask: int, member_value: int):
+        self.mask = mask
+        self.member_value = member_value
+
+    def __get__(self, obj, objtype=None) -> bool:
+        if obj is None:
+            # accessed on the class, where the flag was declared as False.
+            return False
+        return (obj._value & self.mask) == self.member_value
+
+
+class _FlagBit(object):
+    """
+    Flag attribute that is True when any of the flag member's bits are set in the flags value.
+    """
+    __slots__ = ("bits",)
+
+    def __init__(self, bits: int):
+        self.bits = bits
+
+    def __get__(self, obj, objtype=None) -> bool:
+        if obj is None:
+            return False
+        return (obj._value & self.bits) != 0
 
 
 class ClrMetaDataEnum(object):
@@ -27,7 +68,9 @@ class ClrFlags(object):
     """
     Base class for CLR MetaData Tables' Flags.
 
-    When instantiated, this class takes a value and sets member vars to True according to IntEnum's in _masks and _flags.
+    When instantiated, this class takes a value and its member vars are True according to IntEnum's in _masks and _flags.
+    Instances are read-only views of `value`: only the value is stored, and each member var is computed
+    from it when accessed, so neither can be assigned. Since they are immutable, instances may be shared.
 
     Note that _flags are bitmasks that match on single bits, whereas _masks are enum values that match exact value.
 
@@ -40,27 +83,56 @@ class ClrFlags(object):
     _masks: Dict[str, Type[_enum.IntEnum]]
     _flags: Iterable[Type[_enum.IntEnum]]
 
-    def __init__(self, value):
+    # subclasses should define __slots__ too, so that instances hold nothing but the value.
+    # the value is read-only, so that rows with the same flags can share one instance.
+    __slots__ = ("_value",)
+
+    # derived once per subclass from the above, so that instances need no enum lookups:
+    #   _bool_attrs     names of the flags yielded by __iter__, in order.
+    #   _repr_prefixes  the padded left-hand column of __repr__, for each of _bool_attrs.
+    #   _mask_table     (mask, enum class, enum member values) for each of _masks.
+    _bool_attrs: Tuple[str, ...] = ()
+    _repr_prefixes: Tuple[str, ...] = ()
+    _mask_table: Tuple[Tuple[int, Type[_enum.IntEnum], FrozenSet[int]], ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        masks = getattr(cls, "_masks", {})
+        flags = getattr(cls, "_flags", ())
+        cls._bool_attrs = _bool_attr_names(cls, list(masks.values()) + list(flags))
+        cls._repr_prefixes = tuple("{:<40}".format(name) for name in cls._bool_attrs)
+
+        # replace the declared member vars with attributes computed from the value.
+        # as when they were set one by one, _flags take precedence over _masks of the same name.
+        mask_table = []
+        for mask_name, enum_class in masks.items():
+            mask = getattr(cls.corhdr_enum, mask_name)
+            mask_table.append((mask, enum_class, frozenset(m.value for m in enum_class)))
+            for m in enum_class:
+                setattr(cls, m.name, _MaskMember(mask, m.value))
+        for value_class in flags:
+            for m in value_class:
+                setattr(cls, m.name, _FlagBit(m.value))
+        cls._mask_table = tuple(mask_table)
 
-        for mask_name, enum_class in getattr(self, "_masks", {}).items():
-            mask = getattr(self.corhdr_enum, mask_name)
-            masked_value = mask & value
-            enum_entry = enum_class(masked_value)
-            for candidate_enum_entry in enum_class:
-                setattr(self, candidate_enum_entry.name, candidate_enum_entry == enum_entry)
+    def __init__(self, value):
+        for mask, enum_class, member_values in self._mask_table:
+            if mask & value not in member_values:
+                # not a value of the enum, which enum_class(masked_value) would reject too.
+                raise ValueError("%r is not a valid %s" % (mask & value, enum_class.__qualname__))
+        self._value = value
 
-        for value_class in getattr(self, "_flags", {}):
-            for m in value_class:
-                setattr(self, m.name, (m.value & value) != 0)
+    @property
+    def value(self) -> int:
+        """the raw flags value"""
+        return self._value
 
     def __iter__(self):
-        for name in _getvars(self):
-            val = getattr(self, name)
-            if isinstance(val, bool):
-                yield name, val
+        for name in self._bool_attrs:
+            yield name, getattr(self, name)
 
     def __repr__(self):
-        return '\n'.join(["{:<40}{:>8}".format(n, str(v)) for n, v in self])
+        return '\n'.join([p + _REPR_VALUES[v] for p, (_, v) in zip(self._repr_prefixes, self)])
 
 
 class CorHeaderEnum(_enum.IntEnum):
@@ -84,6 +156,9 @@ class ClrHeaderFlags(object):
     CLR_TRACKDEBUGDATA      = False
     CLR_PREFER_32BIT        = False
 
+    _bool_attrs = tuple(sorted(m.name for m in CorHeaderEnum))
+    _repr_prefixes = tuple("{:<40}".format(name) for name in _bool_attrs)
+
     def __init__(self, value):
         """
         Given a value, instantiates self with members set to True according to value.
@@ -92,12 +167,11 @@ class ClrHeaderFlags(object):
             setattr(self, m.name, (m.value & value) != 0)
 
     def __iter__(self):
-        for name in _getvars(self):
-            if name.startswith("CLR_"):
-                yield name, getattr(self, name)
+        for name in self._bool_attrs:
+            yield name, getattr(self, name)
 
     def __repr__(self):
-        return '\n'.join(["{:<40}{:>8}".format(n, str(v)) for n, v in self])
+        return '\n'.join([p + _REPR_VALUES[v] for p, (_, v) in zip(self._repr_prefixes, self)])
 
 
 ####
@@ -167,6 +241,8 @@ class CorTypeAttr(ClrMetaDataEnum):
 
 
 class ClrTypeAttr(ClrFlags):
+    __slots__ = ()
+
     tdNotPublic             = False
     tdPublic                = False
     tdNestedPublic          = False
@@ -257,6 +333,8 @@ class CorFieldAttr(ClrMetaDataEnum):
 
 
 class ClrFieldAttr(ClrFlags):
+    __slots__ = ()
+
     fdPrivateScope              = False         # Member not referenceable.
     fdPrivate                   = False         # Accessible only by the parent type.
     fdFamANDAssem               = False         # Accessible by sub-types only in this Assembly.
@@ -344,6 +422,8 @@ class CorMethodAttr(ClrMetaDataEnum):
 
 
 class ClrMethodAttr(ClrFlags):
+    __slots__ = ()
+
     mdPrivateScope              = False         # Member not referenceable.
     mdPrivate                   = False         # Accessible only by the parent type.
     mdFamANDAssem               = False         # Accessible by sub-types only in this Assembly.
@@ -422,6 +502,8 @@ class CorMethodImpl(ClrMetaDataEnum):
 
 
 class ClrMethodImpl(ClrFlags):
+    __slots__ = ()
+
     miIL                = False         # Method impl is IL.
     miNative            = False         # Method impl is native.
     miOPTIL             = False         # Method impl is OPTIL
@@ -472,6 +554,8 @@ class CorParamAttr(ClrMetaDataEnum):
 
 
 class ClrParamAttr(ClrFlags):
+    __slots__ = ()
+
     pdIn                        =   False   # Param is [In]
     pdOut                       =   False   # Param is [out]
     pdOptional                  =   False   # Param is optional
@@ -497,6 +581,8 @@ class CorEventAttr(ClrMetaDataEnum):
 
 
 class ClrEventAttr(ClrFlags):
+    __slots__ = ()
+
     evSpecialName           = False     # event is special. Name describes how.
 
     # Reserved flags for Runtime use only.
@@ -524,6 +610,8 @@ class CorPropertyAttr(ClrMetaDataEnum):
 
 
 class ClrPropertyAttr(ClrFlags):
+    __slots__ = ()
+
     prSpecialName           = False     # property is special.  Name describes how.
 
     # Reserved flags for Runtime use only.
@@ -548,6 +636,8 @@ class CorMethodSemanticsAttr(ClrMetaDataEnum):
 
 
 class ClrMethodSemanticsAttr(ClrFlags):
+    __slots__ = ()
+
     msSetter    = False     # Setter for property
     msGetter    = False     # Getter for property
     msOther     = False     # other method for property or event
@@ -614,6 +704,8 @@ class CorPinvokeMap(ClrMetaDataEnum):
 
 
 class ClrPinvokeMap(ClrFlags):
+    __slots__ = ()
+
     pmNoMangle          = False     # Pinvoke is to use the member name as specified.
 
     # Use this mask to retrieve the CharSet information.
@@ -682,6 +774,8 @@ class CorAssemblyFlags(ClrMetaDataEnum):
 
 
 class ClrAssemblyFlags(ClrFlags):
+    __slots__ = ()
+
     afPublicKey             = False         # The assembly ref holds the full (unhashed) public key.
 
     afPA_None               = False         # Processor Architecture unspecified
@@ -716,6 +810,8 @@ class CorFileFlags(ClrMetaDataEnum):
 
 
 class ClrFileFlags(ClrFlags):
+    __slots__ = ()
+
     ffContainsMetaData      = False     # This is not a resource file
     ffContainsNoMetaData    = False     # This is a resource file or other non-metadata-containing file
 
@@ -741,6 +837,8 @@ class CorManifestResourceFlags(ClrMetaDataEnum):
 
 
 class ClrManifestResourceFlags(ClrFlags):
+    __slots__ = ()
+
     mrPublic                = False     # The Resource is exported from the Assembly.
     mrPrivate               = False     # The Resource is private to the Assembly.
 
@@ -776,6 +874,7 @@ class CorGenericParamAttr(ClrMetaDataEnum):
 
 
 class ClrGenericParamAttr(ClrFlags):
+    __slots__ = ()
 
     # Variance of type parameters only applicable to generic parameters
     # for generic interfaces and delegates
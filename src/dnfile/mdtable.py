@@ -1858,8 +1858,13 @@ class ManifestResourceRow(MDTableRow):
         "Implementation_CodedIndex": ("Implementation", codedindex.Implementation),
     }
 
-    def parse(self, tables: List[ClrMetaDataTable], next_row: Optional[MDTableRow]):
-        super().parse(tables, next_row)
+    def parse(
+        self,
+        tables: List[ClrMetaDataTable],
+        next_row: Optional[MDTableRow],
+        tables_by_name: Optional[Dict[str, ClrMetaDataTable]] = None,
+    ):
+        super().parse(tables, next_row, tables_by_name)
         if self.struct.Implementation_CodedIndex == 0:
             # Special case per ECMA-335. Resource is in current assembly.
             self.Implementation = None
@@ -60,6 +60,11 @@ ResourceTypeStrings: Dict[int, str] = {
     ResourceTypeCode.Stream:    "System.Stream",
 }
 
+# System.DateTime is serialized as a little-endian 64-bit value of 100ns ticks since 0001-01-01
+_DATETIME_STRUCT = struct.Struct("<q")
+_DATETIME_TICKS_MASK = (1 << 62) - 1
+_DATETIME_EPOCH = datetime.datetime(1, 1, 1)
+
 
 class ResourceTypeFactory(object):
 
@@ -224,15 +229,15 @@ class ResourceTypeFactory(object):
         elif type_name == "System.DateTime":
             tsize = 8
             final_bytes = data[offset:offset + tsize]
-            x = struct.unpack("<q", final_bytes)[0]
+            x = _DATETIME_STRUCT.unpack(final_bytes)[0]
             # Value is stored in lower 62-bits
             # https://github.com/dotnet/runtime/blob/17c55f1/src/libraries/System.Private.CoreLib/src/System/DateTime.cs#L130-L138
-            x = x & ((1 << 62) - 1)
+            x = x & _DATETIME_TICKS_MASK
             # https://stackoverflow.com/questions/3169517/python-c-sharp-binary-datetime-encoding
-            secs = x / 10.0 ** 7
-            delta = datetime.timedelta(seconds=secs)
+            # ticks are 100ns units, keep the conversion in integers to avoid float rounding.
+            delta = datetime.timedelta(microseconds=x // 10)
             try:
-                dt = datetime.datetime(1, 1, 1) + delta
+                dt = _DATETIME_EPOCH + delta
                 final_value = dt
             except OverflowError:
                 # TODO warn/error
@@ -19,10 +19,13 @@ from binascii import hexlify as _hexlify
 from pefile import MAX_STRING_LENGTH, Structure
 
 from . import base, errors, mdtable
-from .utils import read_compressed_int
 
 logger = logging.getLogger(__name__)
 
+# heaps keep the items already read, since rows often reference the same item.
+# a heap can hold a great many distinct items, so bound how many are kept per heap.
+_HEAP_ITEMS_CACHE_SIZE = 16384
+
 
 class GenericStream(base.ClrStream):
     """
@@ -65,14 +68,22 @@ class HeapItemBinary(base.HeapItem):
 
     A HeapItemBinary can be compared directly to a bytes object.
     """
+    # one per #Blob lookup, so don't give each instance a __dict__.
+    __slots__ = ("item_size", "value")
+
     item_size: base.CompressedInt
 
-    def __init__(self, data: bytes, rva: Optional[int] = None):
+    def __init__(self, data: bytes, rva: Optional[int] = None, item_size: Optional[base.CompressedInt] = None):
+        """
+        `item_size` is the compressed int at the start of `data`, if the caller has already read it.
+        """
         self.rva = rva
-        # read compressed int, which has a max size of four bytes
-        size = base.CompressedInt.read(data[:4], rva)
+        size = item_size
         if size is None:
-            raise ValueError("invalid compressed int")
+            # read compressed int, which has a max size of four bytes
+            size = base.CompressedInt.read(data[:4], rva)
+            if size is None:
+                raise ValueError("invalid compressed int")
         self.item_size = size
         base.HeapItem.__init__(self, data[:self.item_size.raw_size + self.item_size], rva)
 
@@ -94,6 +105,12 @@ class HeapItemBinary(base.HeapItem):
 class StringsHeap(base.ClrHeap):
     offset_size = 0
 
+    def __init__(self, metadata_rva: int, stream_struct: base.StreamStruct, stream_data: bytes):
+        super().__init__(metadata_rva, stream_struct, stream_data)
+        # items already read, by index, max_length, and encoding.
+        # the same string is often referenced by many rows, e.g. the namespace of TypeRefs.
+        self._items: Dict[Tuple[int, int, str], HeapItemString] = {}
+
     def get_str(self, index, max_length=MAX_STRING_LENGTH, encoding="utf-8", as_bytes=False):
         """
         Given an index (offset), read a null-terminated UTF-8 (or given encoding) string.
@@ -115,6 +132,11 @@ class StringsHeap(base.ClrHeap):
         Given an index (offset), read a null-terminated UTF-8 (or given encoding) string.
         Returns a HeapItemString, or None on error.
         """
+        key = (index, max_length, encoding)
+        item = self._items.get(key)
+        if item is not None:
+            return item
+
         if not self.__data__ or index is None or not max_length:
             return None
 
@@ -127,11 +149,20 @@ class StringsHeap(base.ClrHeap):
             return None
 
         item = HeapItemString(self.__data__[offset:end], rva=self.rva + offset, encoding=encoding)
+        if len(self._items) >= _HEAP_ITEMS_CACHE_SIZE:
+            self._items.clear()
+        self._items[key] = item
 
         return item
 
 
 class BinaryHeap(base.ClrHeap):
+    def __init__(self, metadata_rva: int, stream_struct: base.StreamStruct, stream_data: bytes):
+        super().__init__(metadata_rva, stream_struct, stream_data)
+        # items already read, by index.
+        # the same blob is often referenced by many rows, e.g. the signatures of MemberRefs.
+        self._items: Dict[int, HeapItemBinary] = {}
+
     def get_with_size(self, index: int) -> Optional[Tuple[bytes, int]]:
         try:
             item = self.get(index)
@@ -155,6 +186,10 @@ class BinaryHeap(base.ClrHeap):
         return item.value_bytes()
 
     def get(self, index: int) -> Optional[HeapItemBinary]:
+        item = self._items.get(index)
+        if item is not None:
+            return item
+
         if self.__data__ is None:
             logger.warning("stream has no data")
             return None
@@ -165,13 +200,22 @@ class BinaryHeap(base.ClrHeap):
 
         offset = index
 
-        try:
-            item = HeapItemBinary(self.__data__[index:], rva=self.rva + offset)
-        except ValueError as e:
+        # read the item size first, so that only the bytes of this item are copied,
+        # rather than everything from the index to the end of the heap.
+        # the size is a compressed int, which has a max size of four bytes.
+        # hand it to the item, so that it isn't decoded a second time.
+        rva = self.rva + offset
+        size = base.CompressedInt.read(self.__data__[offset:offset + 4], rva)
+        if size is None:
             # possible invalid compressed int length, such as invalid leading flags.
-            logger.warning(f"stream entry error - {e} @ RVA=0x{hex(self.rva + offset)}")
+            logger.warning(f"stream entry error - invalid compressed int @ RVA=0x{hex(rva)}")
             return None
 
+        item = HeapItemBinary(self.__data__[offset:offset + size.raw_size + size], rva=rva, item_size=size)
+        if len(self._items) >= _HEAP_ITEMS_CACHE_SIZE:
+            self._items.clear()
+        self._items[index] = item
+
         return item
 
 
@@ -288,6 +332,10 @@ class HeapItemGuid(base.HeapItem):
         return f"HeapItemGuid(data={self.__data__},rva={self.rva})"
 
 
+# number of bytes in a guid
+GUID_SIZE = 128 // 8
+
+
 class GuidHeap(base.ClrHeap):
     offset_size = 0
 
@@ -302,21 +350,42 @@ class GuidHeap(base.ClrHeap):
 
         return str(item)
 
-    def get(self, index) -> Optional[HeapItemGuid]:
+    def _get_offset(self, index) -> Optional[int]:
+        """
+        Given a 1-based GUID index, return the offset of the GUID in the stream,
+        or None for a null index.  Raises IndexError if out of range.
+        """
         if index is None or index < 1:
             return None
 
-        size = 128 // 8  # number of bytes in a guid
         # offset into the GUID stream
-        offset = (index - 1) * size
+        offset = (index - 1) * GUID_SIZE
 
-        if offset + size > len(self.__data__):
+        if offset + GUID_SIZE > len(self.__data__):
             raise IndexError("index out of range")
 
-        item = HeapItemGuid(self.__data__[offset:offset + size], self.rva + offset)
+        return offset
+
+    def get(self, index) -> Optional[HeapItemGuid]:
+        offset = self._get_offset(index)
+        if offset is None:
+            return None
+
+        item = HeapItemGuid(self.__data__[offset:offset + GUID_SIZE], self.rva + offset)
 
         return item
 
+    def get_view(self, index) -> Optional[memoryview]:
+        """
+        Like get(), but return a read-only view of the GUID bytes, rather than a HeapItemGuid holding a copy.
+        Useful when just comparing or hashing many GUIDs.
+        """
+        offset = self._get_offset(index)
+        if offset is None:
+            return None
+
+        return self.get_data_view_at_offset(offset, GUID_SIZE)
+
 
 class MDTablesStruct(Structure):
     Reserved_1: int
@@ -401,14 +470,24 @@ class MetaDataTables(base.ClrStream):
     GenericParamConstraint: Optional[mdtable.GenericParamConstraint]
     Unused:                 Optional[mdtable.Unused]
 
+    # attributes populated by `parse()`.
+    # when parsing is deferred, the first access of any of these parses the stream.
+    _parsed_attrs = frozenset(
+        ["header", "tables", "tables_list", "strings_offset_size", "guids_offset_size", "blobs_offset_size"]
+        + [t.name for t in mdtable.ClrMetaDataTableFactory._table_number_map.values()]
+    )
+
     def __init__(self, metadata_rva: int, stream_struct: base.StreamStruct, stream_data: bytes):
         super().__init__(metadata_rva, stream_struct, stream_data)
+        self._init_parsed_attrs()
+
+    def _init_parsed_attrs(self):
+        """
+        Set the default values of the attributes populated by `parse()`.
+        """
         self.header = None
         self.tables = dict()
         self.tables_list = list()
-        strings_offset_size = 0
-        guids_offset_size = 0
-        blobs_offset_size = 0
         self.Module: Optional[mdtable.Module] = None
         self.TypeRef: Optional[mdtable.TypeRef] = None
         self.TypeDef: Optional[mdtable.TypeDef] = None
@@ -448,6 +527,20 @@ class MetaDataTables(base.ClrStream):
         self.GenericParamConstraint: Optional[mdtable.GenericParamConstraint] = None
         self.Unused: Optional[mdtable.Unused] = None
 
+    def setup_lazy_load(self, loader):
+        super().setup_lazy_load(loader)
+        # drop the defaults so that the first access falls through to `__getattr__`
+        for attr in self._parsed_attrs:
+            self.__dict__.pop(attr, None)
+
+    def __getattr__(self, attr):
+        """If parsing of this stream was deferred, parse it and try again."""
+        if self.__dict__.get("_lazy_loader") is not None and attr in self._parsed_attrs:
+            self._init_parsed_attrs()
+            self.force_parse()
+            return getattr(self, attr)
+        raise AttributeError(attr)
+
     def parse(self, streams: List[base.ClrStream], lazy_load=False):
         """
         this may raise an exception if the data cannot be parsed correctly.
@@ -588,7 +681,7 @@ class MetaDataTables(base.ClrStream):
             # Setup lazy loading for all tables
             for table in self.tables_list:
                 if table.row_size > 0 and table.num_rows > 0:
-                    table_data = self.get_data_at_rva(
+                    table_data = self.get_data_view_at_rva(
                         cur_rva, table.row_size * table.num_rows
                     )
                     table.setup_lazy_load(cur_rva, table_data, full_loader)
@@ -599,7 +692,7 @@ class MetaDataTables(base.ClrStream):
             # here, cur_rva points to start of table rows
             for table in self.tables_list:
                 if table.row_size > 0 and table.num_rows > 0:
-                    table_data = self.get_data_at_rva(
+                    table_data = self.get_data_view_at_rva(
                         cur_rva, table.row_size * table.num_rows
                     )
                     table.rva = cur_rva
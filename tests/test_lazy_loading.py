@@ -14,7 +14,10 @@ def test_lazy_loading():
     assert dn.net
     assert dn.net.mdtables
 
+    # the #~ stream is not parsed until its tables are first requested.
+    assert "MemberRef" not in dn.net.mdtables.__dict__
     assert dn.net.mdtables.MemberRef
+    assert "MemberRef" in dn.net.mdtables.__dict__
     assert isinstance(dn.net.mdtables.MemberRef.rows, LazyList)
 
     # LazyList is initialized as a list of `None`.
@@ -29,6 +32,13 @@ def test_lazy_loading():
     assert memref_row.Signature
     assert "Signature" in memref_row.__dict__
 
+    # each property is resolved on its own, not along with the others resolved the same way.
+    typeref_row = dn.net.mdtables.TypeRef.rows[1]
+    assert typeref_row.TypeName
+    assert "TypeNamespace" not in typeref_row.__dict__
+    assert typeref_row.TypeNamespace is not None
+    assert "TypeNamespace" in typeref_row.__dict__
+
     # The first item of the rows list is a special case, because it is
     # initialized without data before lazy-loading is setup.
     # Make sure that it behaves the same as any other row when accessed.
@@ -37,6 +47,15 @@ def test_lazy_loading():
     typeref_row = dn.net.mdtables.TypeRef.rows[:3:2][0]
     assert isinstance(typeref_row, TypeRefRow)
 
+    # Negative slice bounds are resolved against the table length, so the
+    # last row must come from the end of the table data.
+    typeref_table = dn.net.mdtables.TypeRef
+    last_row = typeref_table.rows[-1:][0]
+    assert last_row.struct.get_file_offset() == (
+        typeref_table.file_offset + typeref_table.row_size * (typeref_table.num_rows - 1)
+    )
+    assert typeref_table.rows[-1] is last_row
+
     assert "ResolutionScope" not in typeref_row.__dict__
     # TypeRefRow.Class should trigger a full load of all tables and rows.
     assert memref_row.Class
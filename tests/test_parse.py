@@ -191,6 +191,10 @@ def test_typedef_extends():
     assert typedefs[0].TypeName == "<Module>"
     assert typedefs[1].TypeName == "HelloWorld"
 
+    # <Module> extends nothing: a null reference, not the last row of the table.
+    assert typedefs[0].Extends.row_index == 0
+    assert typedefs[0].Extends.row is None
+
     #   .class public auto ansi beforefieldinit HelloWorld
     #      extends [mscorlib]System.Object
 
@@ -211,6 +215,27 @@ def test_typedef_extends():
     assert assembly.Name == "mscorlib"
 
 
+def test_table_column():
+    path = fixtures.get_data_path_by_name("hello-world.exe")
+
+    dn = dnfile.dnPE(path)
+    assert dn.net is not None
+
+    typedefs = dn.net.mdtables.TypeDef
+    names = typedefs.get_column("TypeName_StringIndex")
+    assert names == [row.struct.TypeName_StringIndex for row in typedefs]
+    assert [dn.net.strings.get(i) for i in names[:2]] == ["<Module>", "HelloWorld"]
+
+    with pytest.raises(KeyError):
+        typedefs.get_column("TypeName")
+
+    # a table without rows has no values, but still rejects unknown fields
+    empty = dnfile.mdtable.TypeDef([None] * 64, False, 2, 2, 2, None, None, None)
+    assert empty.get_column("TypeName_StringIndex") == []
+    with pytest.raises(KeyError):
+        empty.get_column("TypeNme_StringIndex")
+
+
 def test_typedef_members():
     path = fixtures.get_data_path_by_name("ModuleCode_x86.exe")
 
@@ -291,6 +316,37 @@ def test_flags():
     assert cls.Flags.tdBeforeFieldInit is True
     assert cls.Flags.tdAbstract is False
 
+    # the flags are computed from the raw value, which is all that is stored
+    assert cls.Flags.value == cls.struct.Flags
+    assert dict(cls.Flags)["tdClass"] is True
+    assert not hasattr(cls.Flags, "__dict__")
+
+    # flags objects are immutable
+    with pytest.raises(AttributeError):
+        cls.Flags.value = 0
+
+
+def test_flags_shared():
+    path = fixtures.get_data_path_by_name("ModuleCode_x86.exe")
+
+    dn = dnfile.dnPE(path)
+    assert dn.net is not None
+
+    rows_by_flags = {}
+    for row in dn.net.mdtables.MethodDef:
+        rows_by_flags.setdefault(row.struct.Flags, []).append(row)
+    assert len(rows_by_flags) > 1
+    assert any(len(rows) > 1 for rows in rows_by_flags.values())
+
+    # rows with the same flags value share one instance
+    for rows in rows_by_flags.values():
+        assert all(row.Flags is rows[0].Flags for row in rows)
+
+    # but rows with different values do not
+    first_rows = [rows[0] for rows in rows_by_flags.values()]
+    assert first_rows[0].Flags is not first_rows[1].Flags
+    assert len({id(row.Flags) for row in first_rows}) == len(first_rows)
+
 
 def test_heap_items():
 